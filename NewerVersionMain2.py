@@ -1,19 +1,29 @@
 #!/usr/bin/env python3
 
+import asyncio
+import functools
+import itertools
 import socket
 import ssl
-import threading
+import struct
 import time
 import random
 import platform
+import os
 import json
 import sys
-from queue import Queue
+import multiprocessing
+import queue
 
 from fpdf import FPDF
-from scapy.all import IP, TCP, sr1
 from prometheus_client import start_http_server, Counter
 import paho.mqtt.client as mqtt
+import httptools
+
+try:
+    import uvloop  # libuv event loop, optional
+except ImportError:
+    uvloop = None
 
 # ---------- Configuration ---------- #
 USER_AGENTS = [
@@ -26,13 +36,27 @@ USER_AGENTS = [
     "curl/7.79.1"
 ]
 
-# Prometheus Metrics
+# Pre-encoded request fragments, written with writev/sendmsg by the transport
+_UA_LINES = [f"User-Agent: {ua}\r\n".encode() for ua in USER_AGENTS]
+_CONNECTION_LINES = {True: b"Connection: keep-alive\r\n\r\n", False: b"Connection: close\r\n\r\n"}
+
+# Bytes of each response kept for the verbose report
+PREVIEW_SIZE = 200
+SAMPLE_COUNT = 3  # Previews kept per run, only when verbose
+RECV_BUFFER_SIZE = 65536
+SOCKET_BUFFER_SIZE = 1 << 20  # SO_SNDBUF / SO_RCVBUF on every connection
+
+# One TLS context for every connection, loading CA certs is expensive
+_SSL_CTX = ssl.create_default_context()
+
+# Prometheus Metrics, workers push their counts every METRICS_FLUSH_INTERVAL seconds
+METRICS_FLUSH_INTERVAL = 0.5
 requests_total = Counter('loadtest_requests_total', 'Total Requests Sent')
 requests_failed = Counter('loadtest_requests_failed', 'Failed Requests')
 
 # ---------- Utilities ---------- #
-def get_random_user_agent():
-    return random.choice(USER_AGENTS)
+# Bound once so per-request picks skip the module attribute lookup
+_randrange = random.randrange
 
 def resolve_hostname(host):
     try:
@@ -43,6 +67,15 @@ def resolve_hostname(host):
         print(f"[nslookup error] Could not resolve {host}: {e}")
         return None
 
+def split_evenly(total, parts, i):
+    # Size of part i when total is spread over parts, remainder goes first
+    return total // parts + (i < total % parts)
+
+def run_event_loop(coro):
+    if uvloop is not None:
+        return uvloop.run(coro)
+    return asyncio.run(coro)
+
 def generate_pdf_report(success_count, fail_count, elapsed):
     pdf = FPDF()
     pdf.add_page()
@@ -53,49 +86,239 @@ def generate_pdf_report(success_count, fail_count, elapsed):
     pdf.cell(200, 10, txt=f"Elapsed Time: {elapsed:.2f}s", ln=4)
     pdf.output("report.pdf")
 
-# ---------- Raw Request Core ---------- #
-def raw_http_request(host, port=80, use_ssl=False, method="GET", path="/", headers=None, timeout=5, verbose=False):
-    if headers is None:
-        headers = {}
+# ---------- Connection Pool ---------- #
+class ConnectionPool:
+    # Idle keep-alive HTTPConnections keyed by (host, port, use_ssl)
+    def __init__(self):
+        self.idle = {}
+
+    def get(self, key):
+        conns = self.idle.get(key)
+        while conns:
+            conn = conns.pop()
+            if not conn.closed:
+                return conn
+        return None
 
+    def put(self, key, conn):
+        self.idle.setdefault(key, []).append(conn)
+
+    def close(self):
+        for conns in self.idle.values():
+            for conn in conns:
+                conn.close()
+        self.idle.clear()
+
+def new_socket(family):
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    # No Nagle: a small request must not wait on the ACK of the previous one
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
+    # Reuse flags only affect bind(), connect() still gets a fresh ephemeral port
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if hasattr(socket, "SO_REUSEPORT"):
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.setblocking(False)
+    return sock
+
+def _numeric_addr(host, port):
+    # IP literals, like the address resolved once by run(), need no lookup
+    for family in (socket.AF_INET, socket.AF_INET6):
+        try:
+            socket.inet_pton(family, host)
+        except OSError:
+            continue
+        return [(family, (host, port))]
+    return None
+
+async def connect_socket(host, port, timeout):
+    # Tries each resolved address in turn, like loop.create_connection does
+    loop = asyncio.get_running_loop()
+    infos = _numeric_addr(host, port)
+    if infos is None:
+        infos = [(family, addr) for family, _, _, _, addr in await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)]
+    for i, (family, addr) in enumerate(infos):
+        sock = new_socket(family)
+        try:
+            await asyncio.wait_for(loop.sock_connect(sock, addr), timeout)
+            return sock
+        except OSError:
+            sock.close()
+            if i == len(infos) - 1:
+                raise
+        except BaseException:
+            sock.close()
+            raise
+
+async def open_connection(host, port, use_ssl, timeout, server_hostname=None):
+    loop = asyncio.get_running_loop()
+    sock = await connect_socket(host, port, timeout)
+    ssl_args = {"ssl": _SSL_CTX, "server_hostname": server_hostname or host} if use_ssl else {}
     try:
-        sock = socket.create_connection((host, port), timeout=timeout)
-        if use_ssl:
-            context = ssl.create_default_context()
-            sock = context.wrap_socket(sock, server_hostname=host)
-
-        request_lines = [f"{method} {path} HTTP/1.1",
-                         f"Host: {host}",
-                         f"User-Agent: {get_random_user_agent()}"]
-
-        for k, v in headers.items():
-            request_lines.append(f"{k}: {v}")
+        _, conn = await asyncio.wait_for(loop.create_connection(HTTPConnection, sock=sock, **ssl_args), timeout)
+    except BaseException:
+        sock.close()
+        raise
+    return conn
 
-        request_lines.append("Connection: close")
-        request_lines.append("")
+# ---------- Raw Request Core ---------- #
+class _ResponseHandler:
+    # httptools callback target, only needs to know where the message ends
+    def __init__(self):
+        self.parser = httptools.HttpResponseParser(self)
+        self.headers_complete = False
+        self.framed = False  # Content-Length or chunked, EOF can't end the body
+        self.complete = False
+        self.keep_alive = False
+
+    def on_header(self, name, value):
+        name = name.lower()
+        if name == b"content-length" or (name == b"transfer-encoding" and b"chunked" in value.lower()):
+            self.framed = True
+
+    def on_headers_complete(self):
+        self.headers_complete = True
+
+    def on_message_complete(self):
+        # llhttp resets its flags right after this callback, so ask now
+        self.complete = True
+        self.keep_alive = self.parser.should_keep_alive()
+        self.parser = None
+
+class HTTPConnection(asyncio.BufferedProtocol):
+    # The transport recv_into()s one buffer allocated per connection, which
+    # is reused for every response sent over it
+    def __init__(self):
+        self.buffer = memoryview(bytearray(RECV_BUFFER_SIZE))
+        self.transport = None
+        self.closed = False
+        self.waiter = None
+        self.handler = None
+        self.response = None
+        self.max_bytes = None
+        self.started = False
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def get_buffer(self, sizehint):
+        return self.buffer
+
+    def buffer_updated(self, nbytes):
+        if self.waiter is None or self.waiter.done():
+            self.close()  # Data nobody asked for, the connection is out of sync
+            return
 
-        request_data = "\r\n".join(request_lines).encode()
-        sock.sendall(request_data)
+        # The parser sees every byte, but only the first max_bytes are kept
+        data = self.buffer[:nbytes]
+        self.started = True
+        if self.max_bytes is None:
+            self.response += data
+        elif len(self.response) < self.max_bytes:
+            self.response += data[:self.max_bytes - len(self.response)]
+
+        try:
+            self.handler.parser.feed_data(data)
+        except Exception as e:
+            self.waiter.set_exception(e)
+            return
+        if self.handler.complete:
+            self.waiter.set_result(None)
+
+    def eof_received(self):
+        self.connection_lost(None)
+
+    def connection_lost(self, exc):
+        self.closed = True
+        if self.waiter is not None and not self.waiter.done():
+            handler = self.handler
+            if exc is None and handler.headers_complete and not handler.framed:
+                self.waiter.set_result(None)  # Body delimited by connection close
+            elif not self.started:
+                self.waiter.set_exception(exc or ConnectionResetError("Connection closed before response"))
+            else:
+                self.waiter.set_exception(exc or ConnectionResetError("Connection closed mid-response"))
+
+    async def request(self, request, timeout, max_bytes=None):
+        if self.closed:
+            raise ConnectionResetError("Connection already closed")
+
+        self.handler = _ResponseHandler()
+        self.response = bytearray()
+        self.max_bytes = max_bytes
+        self.started = False
+        self.waiter = asyncio.get_running_loop().create_future()
+
+        self.transport.writelines(request)
+        await asyncio.wait_for(self.waiter, timeout)
+        return bytes(self.response), self.handler.keep_alive
+
+    def close(self):
+        self.closed = True
+        self.transport.close()
+
+@functools.lru_cache(maxsize=256)
+def _request_prefix(method, path, host):
+    # Repeat calls against the same target reuse the encoded request line
+    return f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n".encode()
+
+def build_request(host, method="GET", path="/", headers=None, user_agent=None, keep_alive=False):
+    # Returns iovec fragments, no join into one buffer
+    iov = [_request_prefix(method, path, host),
+           f"User-Agent: {user_agent}\r\n".encode() if user_agent else _UA_LINES[_randrange(len(_UA_LINES))]]
+
+    if headers:
+        iov.append("".join(f"{k}: {v}\r\n" for k, v in headers.items()).encode())
+
+    iov.append(_CONNECTION_LINES[keep_alive])  # Also ends headers
+    return iov
+
+async def raw_http_request(host, port=80, use_ssl=False, method="GET", path="/", headers=None, timeout=5, verbose=False, pool=None, max_bytes=None, prebuilt=None, connect_host=None):
+    # host goes into the Host header and SNI, connect_host (an IP resolved
+    # once up front) is what gets dialed when given.
+    # Returns ("OK", raw response bytes) or ("ERR", error message).
+    try:
+        # prebuilt: fully rendered requests, one per User-Agent
+        if prebuilt:
+            request = prebuilt[_randrange(len(prebuilt))]
+        else:
+            request = build_request(host, method, path, headers, keep_alive=pool is not None)
 
         if verbose:
-            print("[Request Headers]", "\n".join(request_lines))
+            print("[Request Headers]", b"".join(request).decode())
 
-        response = b""
-        while True:
-            chunk = sock.recv(4096)
-            if not chunk:
-                break
-            response += chunk
+        key = (host, port, use_ssl)
+        conn = pool.get(key) if pool is not None else None
+        if conn is not None:
+            try:
+                response, keep_alive = await conn.request(request, timeout, max_bytes)
+            except Exception as e:
+                conn.close()
+                if not isinstance(e, ConnectionError) or conn.started:
+                    raise
+                conn = None  # Idle connection was dropped by the server, retry on a fresh one
+
+        if conn is None:
+            conn = await open_connection(connect_host or host, port, use_ssl, timeout, server_hostname=host)
+            try:
+                response, keep_alive = await conn.request(request, timeout, max_bytes)
+            except Exception:
+                conn.close()
+                raise
 
-        sock.close()
-        return response.decode(errors='ignore')
+        if pool is not None and keep_alive:
+            pool.put(key, conn)
+        else:
+            conn.close()
+        return "OK", response  # Raw bytes, decoding is left to whoever prints it
 
     except Exception as e:
-        return f"Error: {e}"
+        return "ERR", str(e) or type(e).__name__  # str(TimeoutError()) is empty
 
 # ---------- Load Tester Class ---------- #
 class LoadTester:
-    def __init__(self, host, port=80, use_ssl=False, path="/", concurrency=10, total_requests=100, interval=0, verbose=False):
+    def __init__(self, host, port=80, use_ssl=False, path="/", concurrency=10, total_requests=100, interval=0, verbose=False, rps=None, shards=1):
         self.host = host
         self.port = port
         self.use_ssl = use_ssl
@@ -104,68 +327,233 @@ class LoadTester:
         self.total_requests = total_requests
         self.interval = interval
         self.verbose = verbose
+        # Total requests per second across all workers, 0 = unpaced.
+        # Without rps, interval becomes the same overall rate, concurrency / interval.
+        self.target_rps = rps or (concurrency / interval if interval > 0 else 0)
+        self.shards = shards or os.cpu_count() or 1  # 0 = one process per CPU
 
-        self.queue = Queue()
-        self.lock = threading.Lock()
         self.success = 0
         self.errors = 0
-        self.responses = []
-
-    def worker(self):
-        while not self.queue.empty():
+        self.responses = []  # First SAMPLE_COUNT previews, only when verbose
+        self.pool = ConnectionPool()
+        # Host, path and method are fixed for the tester, only the User-Agent varies
+        self.prebuilt = [(b"".join(build_request(host, path=path, user_agent=ua, keep_alive=True)),) for ua in USER_AGENTS]
+        self.tickets = None
+        self.start = 0
+        self.shard_queue = None  # Set inside a shard process, see run_shards()
+        self.resolved_ip = None
+
+    async def worker(self):
+        # Workers claim request indexes from one shared counter, so a slow
+        # connection never strands a fixed slice of the run. The index is the
+        # request's pacing ticket. Each worker keeps its own counts.
+        ok = err = 0
+        # Names used on every request, bound once as locals
+        host, port, use_ssl, path, verbose = self.host, self.port, self.use_ssl, self.path, self.verbose
+        pool, prebuilt, connect_host = self.pool, self.prebuilt, self.resolved_ip
+        total, rps, start, responses = self.total_requests, self.target_rps, self.start, self.responses
+        flush, monotonic, sleep, request = self.flush, time.monotonic, asyncio.sleep, raw_http_request
+        # Without verbose nothing is copied out of the receive buffer at all
+        max_bytes = PREVIEW_SIZE if verbose else 0
+        next_flush = monotonic() + METRICS_FLUSH_INTERVAL
+        for i in self.tickets:
+            if i >= total:
+                break
+            if rps:
+                # Shared schedule: ticket i is due at start + i / rps
+                delay = start + i / rps - monotonic()
+                if delay > 0:
+                    await sleep(delay)
             try:
-                _ = self.queue.get_nowait()
-                response = raw_http_request(self.host, self.port, self.use_ssl, path=self.path, verbose=self.verbose)
-                with self.lock:
-                    if response.startswith("Error:"):
-                        self.errors += 1
-                        requests_failed.inc()
-                    else:
-                        self.success += 1
-                        requests_total.inc()
-                        self.responses.append(response[:200])
+                result, response = await request(host, port, use_ssl, path=path, verbose=verbose, pool=pool, max_bytes=max_bytes, prebuilt=prebuilt, connect_host=connect_host)
+                if result != "OK":
+                    err += 1
+                else:
+                    ok += 1
+                    if max_bytes and len(responses) < SAMPLE_COUNT:
+                        responses.append(response)
             except Exception:
-                with self.lock:
-                    self.errors += 1
-                    requests_failed.inc()
-            finally:
-                self.queue.task_done()
-                if self.interval > 0:
-                    time.sleep(self.interval)
+                err += 1
+            if monotonic() >= next_flush:
+                flush(ok, err)
+                ok = err = 0
+                next_flush = monotonic() + METRICS_FLUSH_INTERVAL
+        flush(ok, err)
+
+    def flush(self, ok, err):
+        self.success += ok
+        self.errors += err
+        if self.shard_queue is not None:
+            self.shard_queue.put((ok, err, None))  # The parent owns the Prometheus counters
+        else:
+            requests_total.inc(ok)
+            requests_failed.inc(err)
+
+    async def _main(self):
+        self.tickets = itertools.count()
+        self.start = time.monotonic()
+        try:
+            await asyncio.gather(*(self.worker() for _ in range(min(self.concurrency, self.total_requests))))
+        finally:
+            self.pool.close()
+
+    def shard_params(self, i, n_shards):
+        return dict(host=self.host, port=self.port, use_ssl=self.use_ssl, path=self.path,
+                    concurrency=split_evenly(self.concurrency, n_shards, i),
+                    total_requests=split_evenly(self.total_requests, n_shards, i),
+                    verbose=self.verbose, rps=self.target_rps / n_shards)
+
+    def run_shards(self, n_shards):
+        # One process per shard, each with its own event loop, pool, RNG and
+        # counters. Shards only send back count deltas and their samples.
+        shard_queue = multiprocessing.Queue()
+        procs = []
+        for i in range(n_shards):
+            params = self.shard_params(i, n_shards)
+            proc = multiprocessing.Process(target=_run_shard, args=(params, self.resolved_ip, shard_queue), daemon=True)
+            proc.start()
+            procs.append(proc)
+
+        finished = 0
+        while finished < n_shards:
+            try:
+                ok, err, samples = shard_queue.get(timeout=1)
+            except queue.Empty:
+                if not any(proc.is_alive() for proc in procs):
+                    break  # A shard died without reporting back
+                continue
+            self.flush(ok, err)
+            if samples is not None:
+                self.responses.extend(samples)
+                finished += 1
+
+        for proc in procs:
+            proc.join()
 
     def run(self):
         print(f"\n[+] Starting Load Test on {self.host}:{self.port}{self.path}")
-        resolved_ip = resolve_hostname(self.host)
-        if not resolved_ip:
+        self.resolved_ip = resolve_hostname(self.host)
+        if not self.resolved_ip:
             return
 
-        for _ in range(self.total_requests):
-            self.queue.put(1)
-
-        threads = []
+        n_shards = min(self.shards, self.concurrency, self.total_requests)
         start_time = time.time()
-
-        for _ in range(self.concurrency):
-            t = threading.Thread(target=self.worker)
-            t.daemon = True
-            t.start()
-            threads.append(t)
-
-        self.queue.join()
+        if n_shards > 1:
+            self.run_shards(n_shards)
+        else:
+            run_event_loop(self._main())
         elapsed = time.time() - start_time
 
         print(f"\n[✓] Load Test Complete in {elapsed:.2f}s")
         print(f"Success: {self.success}, Errors: {self.errors}")
         if self.verbose and self.responses:
-            for i, r in enumerate(self.responses[:3]):
-                print(f"\n[{i+1}]:\n{r}\n")
+            for i, r in enumerate(self.responses[:SAMPLE_COUNT]):
+                print(f"\n[{i+1}]:\n{r.decode(errors='ignore')}\n")
 
         generate_pdf_report(self.success, self.errors, elapsed)
 
+# ---------- Shards ---------- #
+def _run_shard(params, resolved_ip, shard_queue):
+    random.seed()  # Forked shards would otherwise pick the same User-Agents
+    tester = LoadTester(**params)
+    tester.resolved_ip = resolved_ip
+    tester.shard_queue = shard_queue
+    run_event_loop(tester._main())
+    shard_queue.put((0, 0, tester.responses))
+
 # ---------- OS Fingerprint ---------- #
-def fingerprint_tcp_stack(target_ip):
-    pkt = IP(dst=target_ip)/TCP(dport=80, flags="S")
-    resp = sr1(pkt, timeout=2, verbose=0)
+TCP_OPTION_NAMES = {2: "MSS", 3: "WScale", 4: "SAckOK", 5: "SAck", 8: "Timestamp"}
+
+def _checksum(data):
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+def _source_ip_for(target_ip):
+    # Connecting a UDP socket sends nothing, it only picks the outbound interface
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        s.connect((target_ip, 80))
+        return s.getsockname()[0]
+
+def _build_syn(src_ip, dst_ip, src_port, dst_port):
+    src, dst = socket.inet_aton(src_ip), socket.inet_aton(dst_ip)
+    tcp = struct.pack("!HHIIBBHHH", src_port, dst_port, random.getrandbits(32), 0, 5 << 4, 0x02, 65535, 0, 0)
+    pseudo_header = struct.pack("!4s4sBBH", src, dst, 0, socket.IPPROTO_TCP, len(tcp))
+    tcp = tcp[:16] + struct.pack("!H", _checksum(pseudo_header + tcp)) + tcp[18:]
+
+    ip = struct.pack("!BBHHHBBH4s4s", 0x45, 0, 20 + len(tcp), random.getrandbits(16), 0, 64, socket.IPPROTO_TCP, 0, src, dst)
+    ip = ip[:10] + struct.pack("!H", _checksum(ip)) + ip[12:]
+    return ip + tcp
+
+def _parse_tcp_options(data):
+    options = []
+    i = 0
+    while i < len(data):
+        kind = data[i]
+        if kind == 0:  # End of options
+            break
+        if kind == 1:
+            options.append(("NOP", None))
+            i += 1
+            continue
+        if i + 1 >= len(data) or data[i + 1] < 2:
+            break
+        value = data[i + 2:i + data[i + 1]]
+        if kind == 2 and len(value) == 2:
+            value = struct.unpack("!H", value)[0]
+        elif kind == 3 and len(value) == 1:
+            value = value[0]
+        elif kind == 8 and len(value) == 8:
+            value = struct.unpack("!II", value)
+        options.append((TCP_OPTION_NAMES.get(kind, kind), value))
+        i += data[i + 1]
+    return options
+
+def fingerprint_tcp_stack(target_ip, port=80, timeout=2, use_scapy=False):
+    if use_scapy:
+        return fingerprint_tcp_stack_scapy(target_ip, port, timeout)
+
+    src_port = random.randint(1024, 65535)
+    packet = _build_syn(_source_ip_for(target_ip), target_ip, src_port, port)
+
+    with socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_TCP) as sock:
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_HDRINCL, 1)
+        sock.sendto(packet, (target_ip, 0))
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            sock.settimeout(remaining)
+            try:
+                resp, addr = sock.recvfrom(65535)
+            except socket.timeout:
+                return
+
+            # The raw socket sees all inbound TCP, keep only the reply to our SYN
+            ihl = (resp[0] & 0x0F) * 4
+            if addr[0] != target_ip or len(resp) < ihl + 20:
+                continue
+            sport, dport = struct.unpack_from("!HH", resp, ihl)
+            if sport != port or dport != src_port:
+                continue
+
+            ttl = resp[8]
+            window = struct.unpack_from("!H", resp, ihl + 14)[0]
+            data_offset = (resp[ihl + 12] >> 4) * 4
+            options = _parse_tcp_options(resp[ihl + 20:ihl + data_offset])
+            print(f"[TCP-FP] TTL={ttl}, Window={window}, Options={options}")
+            return
+
+def fingerprint_tcp_stack_scapy(target_ip, port=80, timeout=2):
+    from scapy.all import IP, TCP, sr1  # Slow to import, only loaded on --scapy
+
+    pkt = IP(dst=target_ip)/TCP(dport=port, flags="S")
+    resp = sr1(pkt, timeout=timeout, verbose=0)
     if resp:
         print(f"[TCP-FP] TTL={resp.ttl}, Window={resp[TCP].window}, Options={resp[TCP].options}")
 
@@ -187,15 +575,19 @@ def start_mqtt_worker():
 def print_help():
     print("""
 Usage:
- python3 main.py <host> [port] [https] [path] [concurrency] [total_requests] [interval] [verbose]
+ python3 main.py <host> [port] [https] [path] [concurrency] [total_requests] [interval] [verbose] [rps] [shards] [--scapy]
 
 Example:
- python3 main.py example.com 443 1 /test 10 100 0 1
+ python3 main.py example.com 443 1 /test 10 100 0 1 500 4
     """)
 
 if __name__ == "__main__":
     start_http_server(8000)  # Prometheus metrics server
 
+    use_scapy = "--scapy" in sys.argv  # Fingerprint with Scapy instead of a raw socket
+    if use_scapy:
+        sys.argv.remove("--scapy")
+
     if len(sys.argv) < 2:
         print_help()
         sys.exit(1)
@@ -210,9 +602,11 @@ if __name__ == "__main__":
     total_requests = int(sys.argv[6]) if len(sys.argv) > 6 else 100
     interval = float(sys.argv[7]) if len(sys.argv) > 7 else 0
     verbose = bool(int(sys.argv[8])) if len(sys.argv) > 8 else False
+    rps = float(sys.argv[9]) if len(sys.argv) > 9 else None
+    shards = int(sys.argv[10]) if len(sys.argv) > 10 else 1
 
-    tester = LoadTester(host, port, use_ssl, path, concurrency, total_requests, interval, verbose)
+    tester = LoadTester(host, port, use_ssl, path, concurrency, total_requests, interval, verbose, rps, shards)
     tester.run()
 
     # Optional: Uncomment for TCP fingerprinting
-    # fingerprint_tcp_stack(resolve_hostname(host))
+    # fingerprint_tcp_stack(resolve_hostname(host), use_scapy=use_scapy)